@@ -1,114 +1,165 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
 import networkx as nx
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-
-# Load the dataset
-dravet_data = pd.read_csv('NIH_DravetSyndrome_2014_2024.csv')
-
-# Convert date columns to datetime format
-date_columns = ['Award Notice Date', 'Project Start Date', 'Project End Date', 'Budget Start Date', 'Budget End Date']
-for col in date_columns:
-    dravet_data[col] = pd.to_datetime(dravet_data[col], errors='coerce')
-
-# Convert numerical columns to appropriate data types
-numerical_columns = ['Application ID', 'Fiscal Year', 'Total Cost', 'Total Cost IC']
-for col in numerical_columns:
-    dravet_data[col] = pd.to_numeric(dravet_data[col], errors='coerce')
-
-# Filtering out entries where Fiscal Year is 0
-filtered_data = dravet_data[dravet_data['Fiscal Year'] != 0]
-filtered_data = filtered_data[filtered_data['Type'] != '139104']
-
-# Initialize the Dash app
-app = dash.Dash(__name__)
-
-# Define the layout of the app
-app.layout = html.Div([
-    html.H1("NIH Funding Analysis for Dravet Syndrome and Pediatric Epilepsy Research", style={'textAlign': 'center'}),
-
-    # Filters for selecting fiscal year and state
-    html.Div([
-        html.Div([
-            html.Label("Select Fiscal Year(s):"),
-            dcc.Dropdown(
-                id='fiscal-year-dropdown',
-                options=[{'label': year, 'value': year} for year in sorted(filtered_data['Fiscal Year'].unique())],
-                value=sorted(filtered_data['Fiscal Year'].unique()),
-                multi=True
-            )
-        ], style={'width': '45%', 'display': 'inline-block', 'marginLeft': '3%'}),
-
-        html.Div([
-            html.Label("Select State(s):"),
-            dcc.Dropdown(
-                id='state-dropdown',
-                options=[{'label': state, 'value': state} for state in
-                         sorted(filtered_data['Organization State'].unique())],
-                value=sorted(filtered_data['Organization State'].unique()),
-                multi=True
-            )
-        ], style={'width': '45%', 'display': 'inline-block', 'marginLeft': '1%'})
-    ], style={'marginBottom': 50}),
-
-    dcc.Tabs(id='tabs', value='tab-1', children=[
-        dcc.Tab(label='Exploratory Analysis', value='tab-1'),
-        dcc.Tab(label='Network Analysis', value='tab-2')
-    ]),
-
-    html.Div(id='tabs-content')
-])
-
-
-# Define the callbacks to update the figures based on the selected fiscal years and states
-@app.callback(
-    Output('tabs-content', 'children'),
-    [Input('tabs', 'value'),
-     Input('fiscal-year-dropdown', 'value'),
-     Input('state-dropdown', 'value')]
-)
-def render_content(tab, selected_years, selected_states):
-    # Filter data based on selections
-    filtered_df = filtered_data[(filtered_data['Fiscal Year'].isin(selected_years)) &
-                                (filtered_data['Organization State'].isin(selected_states))]
 
+DATA_PATH = 'NIH_DravetSyndrome_2014_2024.csv'
+# Preprocessed copy of DATA_PATH, rebuilt whenever the CSV is newer than it
+CACHE_PATH = 'NIH_DravetSyndrome_2014_2024.feather'
+
+# Only the columns the dashboard reads are loaded
+numerical_columns = ['Fiscal Year', 'Total Cost']
+category_columns = ['Organization State', 'Administering IC', 'Activity', 'Type', 'Contact PI Person ID']
+text_columns = ['Contact PI / Project Leader', 'Other PI or Project Leader(s)']
+# Arrow-backed pandas strings for the free-text columns, on both the CSV and the Feather cache path
+text_dtype = pd.StringDtype('pyarrow')
+
+
+def load_data():
+    # Memory-map the cached Feather file when it is newer than both the CSV and the preprocessing below
+    if os.path.exists(CACHE_PATH) and os.path.getmtime(CACHE_PATH) >= max(os.path.getmtime(DATA_PATH),
+                                                                         os.path.getmtime(__file__)):
+        try:
+            # Feather stores the text columns as large_string, which pandas would otherwise read back as Python strings
+            return feather.read_table(CACHE_PATH, memory_map=True).to_pandas(
+                types_mapper={pa.string(): text_dtype, pa.large_string(): text_dtype}.get)
+        except (OSError, pa.ArrowException):
+            # An unreadable cache is rebuilt from the CSV below
+            pass
+
+    # Load the dataset with the Arrow CSV reader, parsing repeated labels straight into categories so filters and
+    # groupbys work on integer codes, and keeping free text in Arrow string buffers instead of Python objects
+    dravet_data = pd.read_csv(DATA_PATH, engine='pyarrow', usecols=numerical_columns + category_columns + text_columns,
+                              dtype={**{col: 'category' for col in category_columns},
+                                     **{col: text_dtype for col in text_columns}})
+
+    # Convert numerical columns to appropriate data types
+    for col in numerical_columns:
+        dravet_data[col] = pd.to_numeric(dravet_data[col], errors='coerce')
+
+    # Filtering out entries where Fiscal Year is 0
+    data = dravet_data[dravet_data['Fiscal Year'] != 0]
+    data = data[data['Type'] != '139104'].reset_index(drop=True)
+
+    # Write to a temporary file and rename it into place, so workers starting together never read a partial cache
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(CACHE_PATH)), suffix='.tmp')
+    except OSError:
+        # Read-only deployments simply parse the CSV on every start
+        return data
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            data.to_feather(tmp_file)
+        # mkstemp creates the file owner-only; give the cache the permissions of a normal file
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, CACHE_PATH)
+    except (OSError, pa.ArrowException):
+        # A failed cache write only costs the next start a CSV parse
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
+
+# Index rows by the filter dimensions so selections are sorted-index lookups instead of boolean masks
+filtered_data = load_data().set_index(['Fiscal Year', 'Organization State']).sort_index()
+
+
+def select_rows(frame, key):
+    # .loc raises KeyError when no (year, state) pair in the selection has rows; treat that as an empty selection
+    try:
+        return frame.loc[key, :]
+    except KeyError:
+        return frame.iloc[:0]
+
+
+# Funding totals pre-aggregated over the filter dimensions; selections slice these instead of rescanning every row.
+# A single pass over the rows builds the finest cube, and the coarser ones are summed from it. dropna=False keeps
+# rows with a missing IC or Activity in the year/state totals.
+agg_base = filtered_data.groupby(['Fiscal Year', 'Organization State', 'Administering IC', 'Activity'],
+                                 observed=True, dropna=False)['Total Cost'].sum()
+agg_year_state = agg_base.groupby(level=['Fiscal Year', 'Organization State'], observed=True).sum()
+agg_ic = agg_base.groupby(level=['Fiscal Year', 'Organization State', 'Administering IC'], observed=True).sum()
+agg_activity = agg_base.groupby(level=['Fiscal Year', 'Organization State', 'Activity'], observed=True).sum()
+agg_pi = filtered_data.groupby(
+    ['Fiscal Year', 'Organization State', 'Contact PI Person ID', 'Contact PI / Project Leader'],
+    observed=True)['Total Cost'].agg(['sum', 'count'])
+
+
+def collaboration_edges(df):
+    # One row per (contact PI, co-PI) pair, splitting the '; '-separated co-PI lists with Arrow's string kernels
+    other_pis = pc.split_pattern(pc.fill_null(pa.array(df['Other PI or Project Leader(s)']), ''), pattern='; ')
+    contact_pis = pa.array(df['Contact PI / Project Leader']).take(pc.list_parent_indices(other_pis))
+    edges = pa.table({'Contact PI / Project Leader': contact_pis, 'Other PI': pc.list_flatten(other_pis)})
+    return edges.filter(pc.not_equal(edges['Other PI'], '')).to_pandas()
+
+
+# Build and lay out the full collaboration network once; filtered graphs are views of it that reuse these positions
+G_full = nx.from_pandas_edgelist(collaboration_edges(filtered_data), 'Contact PI / Project Leader', 'Other PI',
+                                 create_using=nx.DiGraph)
+pos_full = nx.spring_layout(G_full, seed=42)
+
+all_years = sorted(filtered_data.index.unique('Fiscal Year'))
+all_states = sorted(filtered_data.index.unique('Organization State'))
+# The dropdowns start with everything selected, so this selection is precomputed for both tabs
+full_selection = (frozenset(all_years), frozenset(all_states))
+
+# Shared pool for building the independent figures of a tab concurrently
+executor = ThreadPoolExecutor(max_workers=4)
+
+
+def _forecast(years, values):
+    # Extrapolate a least-squares linear trend one fiscal year past the last selected year
+    if len(values) < 2:
+        return values[-1]
+    slope, intercept = np.polyfit(years, values, 1)
+    return slope * (years[-1] + 1) + intercept
+
+
+def _build_fig1(selected_totals):
     # Funding Trends Over Time
-    funding_trends = filtered_df.groupby('Fiscal Year')['Total Cost'].sum().reset_index()
-    funding_trends['Total Cost'] = funding_trends['Total Cost'] / 1e6
+    funding_trends = selected_totals.groupby(level='Fiscal Year', observed=True).sum() / 1e6
+    trend_years, trend_totals = funding_trends.index.to_numpy(), funding_trends.to_numpy()
 
-    # Moving average for prediction
-    model = ExponentialSmoothing(funding_trends['Total Cost'], trend='add', seasonal='add', seasonal_periods=4)
-    fit = model.fit()
-    forecast = fit.forecast(1)
+    # Linear trend for prediction
+    forecast = _forecast(trend_years, trend_totals)
 
     # Create a trace for the forecast
     forecast_trace = go.Scatter(
-        x=[funding_trends['Fiscal Year'].max() + 1],
-        y=forecast,
+        x=[funding_trends.index.max() + 1],
+        y=[forecast],
         mode='lines+markers',
         name='Forecast',
         line=dict(dash='dash', color='red')
     )
 
     # Line for moving average
-    moving_avg = funding_trends['Total Cost'].rolling(window=3).mean()
+    moving_avg = funding_trends.rolling(window=3).mean().to_numpy()
 
     fig1 = go.Figure(data=[
         go.Bar(
             name='Total Funding',
-            x=funding_trends['Fiscal Year'],
-            y=funding_trends['Total Cost'],
+            x=trend_years,
+            y=trend_totals,
             marker_color='skyblue',
-            text=funding_trends['Total Cost'].round(2),
+            text=np.round(trend_totals, 2),
             hovertemplate='%{x}<br>Total Funding: $%{text}M'
         ),
         go.Scatter(
             name='Moving Average',
-            x=funding_trends['Fiscal Year'],
+            x=trend_years,
             y=moving_avg,
             mode='lines',
             line=dict(color='orange')
@@ -123,17 +174,19 @@ def render_content(tab, selected_years, selected_states):
         template='plotly_white'
     )
 
+    return fig1.to_dict()
+
+
+def _build_fig2(ic_totals):
     # Funding Distribution by Administering IC
-    funding_by_ic = filtered_df.groupby('Administering IC')['Total Cost'].sum().sort_values(ascending=False).head(
-        10).reset_index()
-    funding_by_ic['Total Cost'] = funding_by_ic['Total Cost'] / 1e6
+    funding_by_ic = ic_totals.groupby(level='Administering IC', observed=True, sort=False).sum().nlargest(10) / 1e6
     fig2 = go.Figure(data=[
         go.Bar(
             name='Total Funding',
-            x=funding_by_ic['Administering IC'],
-            y=funding_by_ic['Total Cost'],
+            x=funding_by_ic.index.to_numpy(),
+            y=funding_by_ic.to_numpy(),
             marker_color='green',
-            text=funding_by_ic['Total Cost'].round(2),
+            text=np.round(funding_by_ic.to_numpy(), 2),
             hovertemplate='%{x}<br>Total Funding: $%{text}M'
         )
     ])
@@ -146,33 +199,37 @@ def render_content(tab, selected_years, selected_states):
         template='plotly_white'
     )
 
+    return fig2.to_dict()
+
+
+def _build_fig3(selected_totals):
     # Geographical Distribution
-    funding_by_state = filtered_df.groupby('Organization State')['Total Cost'].sum().reset_index()
-    funding_by_state['Total Cost'] = funding_by_state['Total Cost'] / 1e6
+    funding_by_state = selected_totals.groupby(level='Organization State', observed=True).sum() / 1e6
     fig3 = px.choropleth(
-        funding_by_state,
-        locations='Organization State',
+        locations=funding_by_state.index.to_numpy(),
         locationmode='USA-states',
-        color='Total Cost',
+        color=funding_by_state.to_numpy(),
         color_continuous_scale='Blues',
         scope='usa',
-        labels={'Total Cost': 'Total Funds ($M)', 'Organization State': 'State'}
+        labels={'color': 'Total Funds ($M)', 'locations': 'State'}
     )
     fig3.update_layout(
         title={'text': 'Total NIH Funding for Dravet Syndrome Research by State', 'x': 0.5, 'xanchor': 'center'}
     )
 
+    return fig3.to_dict()
+
+
+def _build_fig4(activity_totals):
     # Funding Distribution by Activity
-    activity_funding = filtered_df.groupby('Activity')['Total Cost'].sum().sort_values(ascending=False)
-    top_5_activities = activity_funding.head(5)
-    other_activities = activity_funding.iloc[5:].sum()
+    activity_funding = activity_totals.groupby(level='Activity', observed=True, sort=False).sum()
+    top_5_activities = activity_funding.nlargest(5)
+    other_activities = activity_funding.sum() - top_5_activities.sum()
     top_5_activities['Other Types'] = other_activities
-    top_5_activities = top_5_activities.reset_index()
-    top_5_activities['Total Cost'] = top_5_activities['Total Cost'] / 1e6
+    top_5_activities = top_5_activities / 1e6
     fig4 = px.pie(
-        top_5_activities,
-        names='Activity',
-        values='Total Cost',
+        names=top_5_activities.index.to_numpy(),
+        values=top_5_activities.to_numpy(),
         title='Funding Distribution by Type of Activity',
         hole=0.3
     )
@@ -192,126 +249,330 @@ def render_content(tab, selected_years, selected_states):
         }
     )
 
-    if tab == 'tab-1':
-        return [
-            html.Div(dcc.Graph(figure=fig1), style={'width': '50%', 'display': 'inline-block'}),
-            html.Div(dcc.Graph(figure=fig2), style={'width': '50%', 'display': 'inline-block'}),
-            html.Div(dcc.Graph(figure=fig3), style={'width': '50%', 'display': 'inline-block'}),
-            html.Div(dcc.Graph(figure=fig4), style={'width': '50%', 'display': 'inline-block'})
-        ]
+    return fig4.to_dict()
+
+
+def _compute_tab1(selected_years, selected_states):
+    # Slice the funding cubes once, then build the four independent figures concurrently
+    selected_totals = agg_year_state.loc[(selected_years, selected_states)]
+    ic_totals = agg_ic.loc[(selected_years, selected_states, slice(None))]
+    activity_totals = agg_activity.loc[(selected_years, selected_states, slice(None))]
+    futures = [executor.submit(_build_fig1, selected_totals), executor.submit(_build_fig2, ic_totals),
+               executor.submit(_build_fig3, selected_totals), executor.submit(_build_fig4, activity_totals)]
+    return tuple(future.result() for future in futures)
+
+
+def _build_pi_table(pi_totals):
+    # Top PIs by Funding and Projects
+    pi_funding = pi_totals.groupby(level=['Contact PI Person ID', 'Contact PI / Project Leader', 'Organization State'],
+                                   observed=True, sort=False).sum().reset_index()
+    top_10_pis = pi_funding.nlargest(10, 'sum')
+    top_10_pis.columns = ['PI Person ID', 'PI Name', 'State', 'Total Funding', 'Project Count']
+    top_10_pis['Total Funding'] = top_10_pis['Total Funding'] / 1e6
+    fig5 = go.Figure(data=[
+        go.Table(
+            header=dict(values=list(top_10_pis.columns),
+                fill_color='paleturquoise',
+                align='left'),
+            cells=dict(values=[top_10_pis[col] for col in top_10_pis.columns],
+                       fill_color='lavender',
+                       align='left')
+        )
+    ])
+    fig5.update_layout(
+        title={'text': 'Top 10 PIs by Total Funding and Project Count', 'x': 0.5, 'xanchor': 'center'},
+        height=500,
+        template='plotly_white'
+    )
+
+    return fig5.to_dict()
 
-    # Network Analysis
-    elif tab == 'tab-2':
-        # Top PIs by Funding and Projects
-        pi_funding = filtered_df.groupby(['Contact PI Person ID', 'Contact PI / Project Leader', 'Organization State'])[
-            'Total Cost'].agg(['sum', 'count']).reset_index()
-        top_10_pis = pi_funding.sort_values(by='sum', ascending=False).head(10)
-        top_10_pis.columns = ['PI Person ID', 'PI Name', 'State', 'Total Funding', 'Project Count']
-        top_10_pis['Total Funding'] = top_10_pis['Total Funding'] / 1e6
-        fig5 = go.Figure(data=[
-            go.Table(
-                header=dict(values=list(top_10_pis.columns),
-                    fill_color='paleturquoise',
-                    align='left'),
-                cells=dict(values=[top_10_pis[col] for col in top_10_pis.columns],
-                           fill_color='lavender',
-                           align='left')
+
+def _build_network(filtered_df):
+    # View of the full directed graph restricted to the contact PI -> co-PI edges in the selection
+    G = G_full.edge_subgraph(collaboration_edges(filtered_df).itertuples(index=False, name=None))
+
+    # Generate the network graph using Plotly
+    pos = {node: pos_full[node] for node in G.nodes()}  # Layout for the network graph
+
+    # Each edge is drawn as start, end, NaN so Plotly breaks the line between segments
+    edges = list(G.edges())
+    start = np.array([pos[u] for u, _ in edges]).reshape(-1, 2)
+    end = np.array([pos[v] for _, v in edges]).reshape(-1, 2)
+    edge_x = np.full(3 * len(edges), np.nan)
+    edge_y = np.full(3 * len(edges), np.nan)
+    edge_x[0::3], edge_x[1::3] = start[:, 0], end[:, 0]
+    edge_y[0::3], edge_y[1::3] = start[:, 1], end[:, 1]
+
+    edge_trace = go.Scatter(
+        x=edge_x, y=edge_y,
+        line=dict(width=0.5, color='#888'),
+        hoverinfo='none',
+        mode='lines'
+    )
+
+    node_text = list(G.nodes())
+    node_xy = np.array([pos[node] for node in node_text]).reshape(-1, 2)
+
+    node_trace = go.Scatter(
+        x=node_xy[:, 0], y=node_xy[:, 1],
+        mode='markers+text',
+        text=node_text,
+        textposition="bottom center",
+        marker=dict(
+            showscale=True,
+            colorscale='YlGnBu',
+            size=10,
+            colorbar=dict(
+                thickness=15,
+                title='Node Connections',
+                xanchor='left',
+                titleside='right'
+            ),
+            line_width=2)
+    )
+
+    fig6 = go.Figure(data=[edge_trace, node_trace],
+                     layout=go.Layout(
+                         title='Network Graph of PIs and Collaborations',
+                         titlefont_size=16,
+                         showlegend=False,
+                         hovermode='closest',
+                         margin=dict(b=20, l=5, r=5, t=40),
+                         annotations=[dict(
+                             text="Network Graph showing collaborations among PIs",
+                             showarrow=False,
+                             xref="paper", yref="paper",
+                             x=0.005, y=-0.002)],
+                         xaxis=dict(showgrid=False, zeroline=False),
+                         yaxis=dict(showgrid=False, zeroline=False))
+                     )
+    fig6.update_layout(
+        title={'text': 'Network Graph of PIs and Collaborations', 'x': 0.5, 'xanchor': 'center'},
+        height=500,
+        template='plotly_white'
+    )
+
+    return fig6.to_dict()
+
+
+# Network figures are cached per selection, keyed by frozensets so the order of picks in the dropdowns does not matter
+@lru_cache(maxsize=64)
+def _compute_tab2(years_key, states_key):
+    selected_years, selected_states = sorted(years_key), sorted(states_key)
+
+    # Filter data based on selections, reusing the full frame when everything is selected
+    if (years_key, states_key) == full_selection:
+        filtered_df = filtered_data
+    else:
+        filtered_df = select_rows(filtered_data, (selected_years, selected_states))
+
+    pi_totals = select_rows(agg_pi, (selected_years, selected_states, slice(None), slice(None)))
+    futures = [executor.submit(_build_pi_table, pi_totals), executor.submit(_build_network, filtered_df)]
+    return tuple(future.result() for future in futures)
+
+
+def _graph_children(figures):
+    return [html.Div(dcc.Graph(figure=figure), style={'width': '50%', 'display': 'inline-block'})
+            for figure in figures]
+
+
+full_tab2_children = _graph_children(_compute_tab2(*full_selection))
+
+# The browser re-sums the funding cubes for the exploratory tab, so these figures never round-trip to the server.
+# The full-selection figures built by _compute_tab1 serve as templates whose trace data is replaced.
+funding_aggregates = {
+    'year_state': agg_year_state.reset_index().values.tolist(),
+    'ic': agg_ic.reset_index().values.tolist(),
+    'activity': agg_activity.reset_index().values.tolist(),
+    'figures': _compute_tab1(all_years, all_states)
+}
+
+# Initialize the Dash app
+app = dash.Dash(__name__)
+
+# Define the layout of the app
+app.layout = html.Div([
+    html.H1("NIH Funding Analysis for Dravet Syndrome and Pediatric Epilepsy Research", style={'textAlign': 'center'}),
+
+    # Filters for selecting fiscal year and state
+    html.Div([
+        html.Div([
+            html.Label("Select Fiscal Year(s):"),
+            dcc.Dropdown(
+                id='fiscal-year-dropdown',
+                options=[{'label': year, 'value': year} for year in all_years],
+                value=all_years,
+                multi=True
             )
-        ])
-        fig5.update_layout(
-            title={'text': 'Top 10 PIs by Total Funding and Project Count', 'x': 0.5, 'xanchor': 'center'},
-            height=500,
-            template='plotly_white'
-        )
+        ], style={'width': '45%', 'display': 'inline-block', 'marginLeft': '3%'}),
 
-        # Create a directed graph
-        G = nx.DiGraph()
-
-        # Add nodes and edges
-        for _, row in filtered_df.iterrows():
-            main_pi = row['Contact PI Person ID']
-            main_pi_name = row['Contact PI / Project Leader']
-            other_pis = row['Other PI or Project Leader(s)'].split('; ')
-            for other_pi in other_pis:
-                if other_pi:  # Check if other_pi is not an empty string
-                    G.add_edge(main_pi_name, other_pi)
-
-        # Generate the network graph using Plotly
-        pos = nx.spring_layout(G, seed=42)  # Layout for the network graph
-
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.append(x0)
-            edge_x.append(x1)
-            edge_x.append(None)
-            edge_y.append(y0)
-            edge_y.append(y1)
-            edge_y.append(None)
-
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines'
-        )
+        html.Div([
+            html.Label("Select State(s):"),
+            dcc.Dropdown(
+                id='state-dropdown',
+                options=[{'label': state, 'value': state} for state in all_states],
+                value=all_states,
+                multi=True
+            )
+        ], style={'width': '45%', 'display': 'inline-block', 'marginLeft': '1%'})
+    ], style={'marginBottom': 50}),
 
-        node_x = []
-        node_y = []
-        node_text = []
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            node_text.append(node)
-
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=node_text,
-            textposition="bottom center",
-            marker=dict(
-                showscale=True,
-                colorscale='YlGnBu',
-                size=10,
-                colorbar=dict(
-                    thickness=15,
-                    title='Node Connections',
-                    xanchor='left',
-                    titleside='right'
-                ),
-                line_width=2)
-        )
+    dcc.Tabs(id='tabs', value='tab-1', children=[
+        dcc.Tab(label='Exploratory Analysis', value='tab-1'),
+        dcc.Tab(label='Network Analysis', value='tab-2')
+    ]),
 
-        fig6 = go.Figure(data=[edge_trace, node_trace],
-                         layout=go.Layout(
-                             title='Network Graph of PIs and Collaborations',
-                             titlefont_size=16,
-                             showlegend=False,
-                             hovermode='closest',
-                             margin=dict(b=20, l=5, r=5, t=40),
-                             annotations=[dict(
-                                 text="Network Graph showing collaborations among PIs",
-                                 showarrow=False,
-                                 xref="paper", yref="paper",
-                                 x=0.005, y=-0.002)],
-                             xaxis=dict(showgrid=False, zeroline=False),
-                             yaxis=dict(showgrid=False, zeroline=False))
-                         )
-        fig6.update_layout(
-            title={'text': 'Network Graph of PIs and Collaborations', 'x': 0.5, 'xanchor': 'center'},
-            height=500,
-            template='plotly_white'
-        )
+    # Exploratory figures are drawn in the browser from funding_aggregates; the network tab is rendered on the
+    # server into tabs-content whenever network-selection changes
+    html.Div(id='exploratory-content', children=[
+        html.Div(dcc.Graph(id=graph_id), style={'width': '50%', 'display': 'inline-block'})
+        for graph_id in ['funding-trends-graph', 'funding-by-ic-graph', 'funding-by-state-graph',
+                         'funding-by-activity-graph']
+    ]),
+    html.Div(id='tabs-content', style={'display': 'none'}),
 
-        return [
-            html.Div(dcc.Graph(figure=fig5), style={'width': '50%', 'display': 'inline-block'}),
-            html.Div(dcc.Graph(figure=fig6), style={'width': '50%', 'display': 'inline-block'})
-        ]
+    dcc.Store(id='funding-aggregates', data=funding_aggregates, storage_type='memory'),
+    dcc.Store(id='network-selection', storage_type='memory'),
+    # Per-state totals behind the map currently shown, or null while it shows the template
+    dcc.Store(id='funding-map-key', data=None, storage_type='memory')
+])
+
+
+# Update the exploratory figures in the browser based on the selected fiscal years and states
+app.clientside_callback(
+    """
+    function(tab, selectedYears, selectedStates, data, shownMapKey) {
+        const noUpdate = window.dash_clientside.no_update;
+        if (tab !== 'tab-1') {
+            return [noUpdate, noUpdate, noUpdate, noUpdate, {display: 'none'}, noUpdate];
+        }
+        const years = new Set(selectedYears || []);
+        const states = new Set(selectedStates || []);
+        // With every year and state selected the templates are already the answer
+        if (data.year_state.every(row => years.has(row[0]) && states.has(row[1]))) {
+            return data.figures.concat([{display: 'block'}, null]);
+        }
+        const round2 = value => Math.round(value * 100) / 100;
+
+        // Sum the selected cube rows (year, state, ..., total) by one key column, in $ millions
+        function sumBy(rows, keyIndex) {
+            const totals = new Map();
+            rows.forEach(row => {
+                if (years.has(row[0]) && states.has(row[1])) {
+                    totals.set(row[keyIndex], (totals.get(row[keyIndex]) || 0) + row[row.length - 1]);
+                }
+            });
+            return Array.from(totals, ([key, total]) => [key, total / 1e6]);
+        }
+
+        // Copy a template figure and overwrite the given properties of each of its traces
+        function withTraces(figure, traces) {
+            const copy = JSON.parse(JSON.stringify(figure));
+            traces.forEach((trace, i) => Object.assign(copy.data[i], trace));
+            return copy;
+        }
 
-    return html.Div()
+        // Funding Trends Over Time, with a 3-year moving average and a linear-trend forecast
+        const trends = sumBy(data.year_state, 0).sort((a, b) => a[0] - b[0]);
+        const trendYears = trends.map(([year]) => year);
+        const trendTotals = trends.map(([, total]) => total);
+        const movingAvg = trendTotals.map((total, i) =>
+            i < 2 ? null : (trendTotals[i - 2] + trendTotals[i - 1] + total) / 3);
+        const n = trends.length;
+        let forecast = trendTotals[n - 1];
+        if (n >= 2) {
+            const meanYear = trendYears.reduce((a, b) => a + b) / n;
+            const meanTotal = trendTotals.reduce((a, b) => a + b) / n;
+            let sxy = 0, sxx = 0;
+            trendYears.forEach((year, i) => {
+                sxy += (year - meanYear) * (trendTotals[i] - meanTotal);
+                sxx += (year - meanYear) ** 2;
+            });
+            forecast = meanTotal + sxy / sxx * (trendYears[n - 1] + 1 - meanYear);
+        }
+        const fig1 = withTraces(data.figures[0], [
+            {x: trendYears, y: trendTotals, text: trendTotals.map(round2)},
+            {x: trendYears, y: movingAvg},
+            {x: n ? [trendYears[n - 1] + 1] : [], y: n ? [forecast] : []}
+        ]);
+
+        // Top 10 Administering ICs
+        const byIc = sumBy(data.ic, 2).sort((a, b) => b[1] - a[1]).slice(0, 10);
+        const fig2 = withTraces(data.figures[1], [
+            {x: byIc.map(([ic]) => ic), y: byIc.map(([, total]) => total), text: byIc.map(([, total]) => round2(total))}
+        ]);
+
+        // Geographical Distribution; redrawing the map is the costly part in the browser, so it is skipped when
+        // the per-state totals are the same as in the map currently shown
+        const byState = sumBy(data.year_state, 1).sort((a, b) => a[0] < b[0] ? -1 : 1);
+        const mapKey = JSON.stringify(byState);
+        const mapChanged = mapKey !== shownMapKey;
+        const fig3 = mapChanged ? withTraces(data.figures[2], [
+            {locations: byState.map(([state]) => state), z: byState.map(([, total]) => total)}
+        ]) : noUpdate;
+
+        // Top 5 activities, with everything else folded into one slice
+        const byActivity = sumBy(data.activity, 2).sort((a, b) => b[1] - a[1]);
+        const topActivities = byActivity.slice(0, 5);
+        topActivities.push(['Other Types', byActivity.slice(5).reduce((sum, [, total]) => sum + total, 0)]);
+        const fig4 = withTraces(data.figures[3], [
+            {labels: topActivities.map(([activity]) => activity), values: topActivities.map(([, total]) => total)}
+        ]);
+
+        return [fig1, fig2, fig3, fig4, {display: 'block'}, mapChanged ? mapKey : noUpdate];
+    }
+    """,
+    [Output('funding-trends-graph', 'figure'),
+     Output('funding-by-ic-graph', 'figure'),
+     Output('funding-by-state-graph', 'figure'),
+     Output('funding-by-activity-graph', 'figure'),
+     Output('exploratory-content', 'style'),
+     Output('funding-map-key', 'data')],
+    [Input('tabs', 'value'),
+     Input('fiscal-year-dropdown', 'value'),
+     Input('state-dropdown', 'value')],
+    [State('funding-aggregates', 'data'),
+     State('funding-map-key', 'data')]
+)
+
+
+# Show the network tab and pass the selection on to the server only while that tab is open, so dropdown changes on
+# the exploratory tab never reach the server
+app.clientside_callback(
+    """
+    function(tab, selectedYears, selectedStates, current) {
+        const noUpdate = window.dash_clientside.no_update;
+        if (tab !== 'tab-2') {
+            return [noUpdate, {display: 'none'}];
+        }
+        const selection = {years: [...(selectedYears || [])].sort(), states: [...(selectedStates || [])].sort()};
+        // Switching back to the tab with the same selection keeps the network already rendered
+        const changed = JSON.stringify(selection) !== JSON.stringify(current);
+        return [changed ? selection : noUpdate, {display: 'block'}];
+    }
+    """,
+    [Output('network-selection', 'data'),
+     Output('tabs-content', 'style')],
+    [Input('tabs', 'value'),
+     Input('fiscal-year-dropdown', 'value'),
+     Input('state-dropdown', 'value')],
+    State('network-selection', 'data')
+)
+
+
+# Render the network tab on the server based on the selected fiscal years and states
+@app.callback(
+    Output('tabs-content', 'children'),
+    Input('network-selection', 'data'),
+    prevent_initial_call=True
+)
+def render_content(network_selection):
+    # Network Analysis
+    selection = (frozenset(network_selection['years']), frozenset(network_selection['states']))
+    if selection == full_selection:
+        return full_tab2_children
+    return _graph_children(_compute_tab2(*selection))
 
 
 # Run the app